@@ -1131,6 +1131,14 @@ app.post('/api/trading/cancel', async (req, res) => {
   res.json(result);
 });
 
+// Poll a queued trade's status (ids may contain '/', e.g. Kraken pairs)
+app.get('/api/trading/status/*', async (req, res) => {
+  // req.params[0] is decoded; re-encode each segment so ?, # and % in ids survive
+  const tradeId = req.params[0].split('/').map(encodeURIComponent).join('/');
+  const result = await proxyToTrading(`/api/trading/status/${tradeId}`);
+  res.json(result);
+});
+
 // Trading health check
 app.get('/api/trading/health', async (req, res) => {
   const result = await proxyToTrading('/api/trading/health');
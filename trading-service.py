@@ -5,15 +5,26 @@ Provides trading recommendations via HTTP API for the Node.js command center
 """
 
 import sys
+import re
 import json
 import logging
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from operator import attrgetter
 import threading
+import time
+import itertools
+import heapq
+import queue
+from urllib.parse import urlparse, parse_qs, unquote
+from concurrent.futures import Future, ThreadPoolExecutor
 import hashlib
+import hmac
+import functools
 import secrets
 
 # Add parent directory to path for glorb-trader imports
@@ -35,6 +46,19 @@ except ImportError as e:
     KALSHI_API_KEY_ID = None
     KRAKEN_API_KEY = None
 
+# requests is optional here; only used to tune the exchange clients' sessions
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+# orjson is optional; it serializes straight to bytes and is much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -44,7 +68,42 @@ logger = logging.getLogger(__name__)
 # Command center integration
 COMMAND_CENTER_URL = os.environ.get('COMMAND_CENTER_URL', 'http://localhost:3456')
 
-@dataclass
+def encode_json(data) -> bytes:
+    """Serialize data to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode()
+
+def decode_json(body: bytes):
+    """Parse JSON bytes; raises json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+# How long (seconds) upstream results are reused between dashboard polls
+RECOMMENDATIONS_TTL = 10
+BALANCES_TTL = 3
+
+# Concurrent upstream calls: fan-out worker count and per-host keep-alive pool size
+UPSTREAM_CONCURRENCY = 8
+
+# Executed trades and trade statuses retained in memory
+TRADE_HISTORY_LIMIT = 10000
+
+# Number of top-confidence suggestions returned to the dashboard
+RECOMMENDATIONS_LIMIT = 25
+
+# Session lifetime (seconds) and cap on concurrently active sessions
+SESSION_TTL = 3600
+MAX_SESSIONS = 1024
+
+# How long (seconds) a successful password check is reused for repeat logins
+LOGIN_CACHE_TTL = 300
+
+# Process-wide suffix for trade ids; next() on itertools.count is atomic under the GIL
+_trade_id_counter = itertools.count(1)
+
+@dataclass(slots=True)
 class TradeSuggestion:
     """Represents a trading recommendation."""
     market: str  # 'kalshi' or 'kraken'
@@ -56,58 +115,201 @@ class TradeSuggestion:
     reasoning: str
     timestamp: str
     id: str = None
+    _cached_payload: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.id is None:
-            self.id = f"trade_{self.market}_{self.symbol}_{int(datetime.now().timestamp())}"
+            self.id = f"trade_{self.market}_{self.symbol}_{next(_trade_id_counter)}"
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize for the API, memoized since suggestions aren't mutated."""
+        if self._cached_payload is None:
+            self._cached_payload = encode_json({
+                'id': self.id,
+                'market': self.market,
+                'symbol': self.symbol,
+                'side': self.side,
+                'amount': self.amount,
+                'price': self.price,
+                'confidence': self.confidence,
+                'reasoning': self.reasoning,
+                'timestamp': self.timestamp
+            })
+        return self._cached_payload
 
 
 # ============ AUTHENTICATION ============
 
+# PBKDF2 work factor (OWASP recommendation for PBKDF2-HMAC-SHA256)
+PBKDF2_ITERATIONS = 600_000
+
+def _prehash(password: str) -> bytes:
+    """SHA-256 the password so the slow KDF and login cache never see plaintext."""
+    return hashlib.sha256(password.encode()).digest()
+
+def hash_password(password: str) -> str:
+    """Hash a password as 'pbkdf2_sha256$<iterations>$<salt>$<hash>'."""
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', _prehash(password), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+
 # Simple user database (in production, use a real database)
 USERS = {
     "glorbOP": {
-        "password_hash": hashlib.sha256("Zach1441!".encode()).hexdigest(),
+        "password_hash": hash_password("Zach1441!"),
         "role": "admin"
     },
     "admin": {
-        "password_hash": hashlib.sha256("glorb2024".encode()).hexdigest(),
+        "password_hash": hash_password("glorb2024"),
         "role": "admin"
     },
     "glorb": {
-        "password_hash": hashlib.sha256("trader123".encode()).hexdigest(),
+        "password_hash": hash_password("trader123"),
         "role": "user"
     }
 }
 
+# Checked for unknown usernames so they cost the same KDF time as known ones
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_hex(16))
+
+def _check_prehashed(password_hash: str, prehashed: bytes) -> bool:
+    """Run the slow KDF check against a stored hash."""
+    _, iterations, salt, stored = password_hash.split('$')
+    digest = hashlib.pbkdf2_hmac('sha256', prehashed, bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest, bytes.fromhex(stored))
+
+# (username, prehash) -> expires_at for recently verified logins. Only
+# successes are cached, so wrong guesses always pay the full KDF cost.
+_verified_logins: Dict[Tuple[str, bytes], float] = {}
+_verified_lock = threading.Lock()
+
 def verify_password(username: str, password: str) -> bool:
     """Verify username and password."""
     if username not in USERS:
+        # Don't reveal which usernames exist through response timing
+        _check_prehashed(_DUMMY_PASSWORD_HASH, _prehash(password))
         return False
-    stored_hash = USERS[username]['password_hash']
-    return hashlib.sha256(password.encode()).hexdigest() == stored_hash
+    key = (username, _prehash(password))
+    now = time.monotonic()
+    with _verified_lock:
+        expires_at = _verified_logins.get(key)
+    if expires_at is not None and expires_at > now:
+        return True
+    
+    if not _check_prehashed(USERS[username]['password_hash'], key[1]):
+        return False
+    with _verified_lock:
+        _verified_logins[key] = now + LOGIN_CACHE_TTL
+    return True
 
 def generate_session_token() -> str:
     """Generate a session token."""
     return secrets.token_hex(32)
 
-# Session store
-active_sessions = {}
+# Canonical form of generate_session_token() output
+_TOKEN_RE = re.compile(r'[0-9a-f]{64}')
+# Exact length of a well-formed 'Bearer <token>' header
+_BEARER_HEADER_LEN = len('Bearer ') + 64
+
+@dataclass(slots=True)
+class SessionInfo:
+    """An authenticated session."""
+    user: str
+    expires_at: float
+
+# Session store, least recently used first
+active_sessions: "OrderedDict[str, SessionInfo]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+def create_session(username: str) -> str:
+    """Start a session for username and return its token."""
+    token = generate_session_token()
+    with _sessions_lock:
+        active_sessions[token] = SessionInfo(username, time.monotonic() + SESSION_TTL)
+        if len(active_sessions) > MAX_SESSIONS:
+            active_sessions.popitem(last=False)
+    return token
+
+def get_session(token: str) -> Optional[str]:
+    """Return the user for a live session token, or None."""
+    with _sessions_lock:
+        session = active_sessions.get(token)
+        if session is None:
+            return None
+        if session.expires_at <= time.monotonic():
+            del active_sessions[token]
+            return None
+        active_sessions.move_to_end(token)
+        return session.user
+
+@functools.lru_cache(maxsize=1024)
+def _parse_bearer(auth_header: str) -> Optional[str]:
+    """Extract the token from an 'Authorization: Bearer <token>' header."""
+    if not auth_header.startswith('Bearer '):
+        return None
+    token = auth_header[7:]
+    # Only well-formed tokens are ever used as session-store keys
+    return token if _TOKEN_RE.fullmatch(token) else None
 
 
 # ============ TRADING SERVICE ============
 
+def _configure_connection_pool(client):
+    """Size the keep-alive pool of a client's requests.Session, if it has one."""
+    if requests is None:
+        return
+    for attr in ('session', '_session'):
+        session = getattr(client, attr, None)
+        if isinstance(session, requests.Session):
+            break
+    else:
+        logger.debug(f"{type(client).__name__} has no requests.Session to pool")
+        return
+    
+    for prefix in ('https://', 'http://'):
+        current = session.get_adapter(prefix)
+        if getattr(current, '_pool_maxsize', 0) >= UPSTREAM_CONCURRENCY:
+            continue
+        # Keep the client's retry and blocking policy; only the pool size changes
+        session.mount(prefix, HTTPAdapter(
+            pool_connections=UPSTREAM_CONCURRENCY,
+            pool_maxsize=UPSTREAM_CONCURRENCY,
+            max_retries=getattr(current, 'max_retries', 0),
+            pool_block=getattr(current, '_pool_block', False)
+        ))
+    # 'Connection: close' would defeat keep-alive on every request
+    if session.headers.get('Connection', '').lower() == 'close':
+        del session.headers['Connection']
+    logger.info(f"{type(client).__name__} keep-alive pool sized to {UPSTREAM_CONCURRENCY}")
+
+
 class TradingService:
     """Trading service that integrates with the command center."""
     
     def __init__(self):
+        # Guards pending_trades, executed_trades, trade_status and config across handler threads
+        self._lock = threading.RLock()
         self.pending_trades = {}
-        self.executed_trades = []
+        self.executed_trades = deque(maxlen=TRADE_HISTORY_LIMIT)
+        # trade_id -> 'queued' | 'executed' | 'failed' | 'cancelled', oldest first
+        self.trade_status = OrderedDict()
         self.config = {
             'trade_size': DEFAULT_TRADE_SIZE_USD if TRADING_AVAILABLE else 100,
             'confirm_trades': CONFIRM_TRADES if TRADING_AVAILABLE else True,
             'enabled': True
         }
+        # Shared pool for fanning out blocking exchange calls
+        self._pool = ThreadPoolExecutor(max_workers=UPSTREAM_CONCURRENCY)
+        # key -> (expires_at, value), see _cached()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # key -> Future of the fetch in progress, so concurrent misses share it
+        self._inflight = {}
+        # Bumped by invalidate_cache(); fetches started earlier don't store
+        self._cache_generation = 0
+        # Order placement runs on a worker so HTTP handlers don't block on it
+        self._exec_queue = queue.Queue()
+        threading.Thread(target=self._exec_worker, name='trade-executor', daemon=True).start()
         
         if TRADING_AVAILABLE and KALSHI_API_KEY_ID:
             try:
@@ -130,19 +332,23 @@ class TradingService:
         else:
             self.kraken = None
             logger.warning("Kraken client not available - missing credentials")
-    
-    def get_kalshi_recommendations(self) -> List[TradeSuggestion]:
-        """Fetch and analyze Kalshi markets."""
-        suggestions = []
         
+        for client in (self.kalshi, self.kraken):
+            if client is not None:
+                _configure_connection_pool(client)
+    
+    def get_kalshi_recommendations(self) -> Iterator[TradeSuggestion]:
+        """Fetch and analyze Kalshi markets, yielding suggestions."""
         if not TRADING_AVAILABLE or not self.kalshi:
             logger.warning("Kalshi client not available")
-            return suggestions
+            return
         
         try:
             markets = self.kalshi.get_markets(status="active")
+            now_iso = datetime.now().isoformat()
+            trade_size = self.get_config()['trade_size']
             
-            for market in markets[:20]:
+            for market in markets:
                 market_id = market.get('id')
                 title = market.get('title', 'Unknown')
                 current_price = market.get('current_price', 0.5)
@@ -153,37 +359,34 @@ class TradingService:
                 
                 confidence = abs(current_price - 0.5) * 2
                 
-                suggestion = TradeSuggestion(
+                yield TradeSuggestion(
                     market='kalshi',
                     symbol=market_id,
                     side='yes' if current_price > 0.5 else 'no',
-                    amount=self.config['trade_size'],
+                    amount=trade_size,
                     price=current_price,
                     confidence=confidence,
                     reasoning=f"Title: {title}\nPrice: {current_price:.2%}\nVolume: {volume}",
-                    timestamp=datetime.now().isoformat()
+                    timestamp=now_iso
                 )
-                suggestions.append(suggestion)
                 
         except Exception as e:
             logger.error(f"Error fetching Kalshi: {e}")
-        
-        return suggestions
     
-    def get_kraken_recommendations(self, symbols: List[str] = None) -> List[TradeSuggestion]:
-        """Fetch and analyze Kraken markets."""
-        suggestions = []
-        
+    def get_kraken_recommendations(self, symbols: List[str] = None) -> Iterator[TradeSuggestion]:
+        """Fetch and analyze Kraken markets, yielding suggestions."""
         if not TRADING_AVAILABLE or not self.kraken:
             logger.warning("Kraken client not available")
-            return suggestions
+            return
         
         if symbols is None:
             symbols = ['BTC/USD', 'ETH/USD', 'SOL/USD', 'XRP/USD', 'ADA/USD']
         
         try:
-            for symbol in symbols:
-                ticker = self.kraken.get_ticker(symbol)
+            tickers = self._pool.map(self.kraken.get_ticker, symbols)
+            now_iso = datetime.now().isoformat()
+            trade_size = self.get_config()['trade_size']
+            for symbol, ticker in zip(symbols, tickers):
                 if not ticker:
                     continue
                 
@@ -199,33 +402,86 @@ class TradingService:
                 
                 confidence = min(abs(change) / 10, 1.0)
                 
-                suggestion = TradeSuggestion(
+                yield TradeSuggestion(
                     market='kraken',
                     symbol=symbol,
                     side='buy' if change > 0 else 'sell',
-                    amount=self.config['trade_size'] / last,
+                    amount=trade_size / last,
                     price=last,
                     confidence=confidence,
                     reasoning=f"Symbol: {symbol}\nPrice: ${last:.2f}\n24h Change: {change:.2f}%\nVolume: {volume}",
-                    timestamp=datetime.now().isoformat()
+                    timestamp=now_iso
                 )
-                suggestions.append(suggestion)
                 
         except Exception as e:
             logger.error(f"Error fetching Kraken: {e}")
+    
+    def _cached(self, key: str, ttl: float, compute, force_refresh: bool = False):
+        """Return a memoized result for key; concurrent misses share one compute()."""
+        with self._cache_lock:
+            now = time.monotonic()
+            entry = self._cache.get(key)
+            if not force_refresh and entry and entry[0] > now:
+                return entry[1]
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                generation = self._cache_generation
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            return future.result()
         
-        return suggestions
-    
-    def get_all_recommendations(self) -> List[TradeSuggestion]:
-        """Get recommendations from all markets."""
-        all_suggestions = []
-        all_suggestions.extend(self.get_kalshi_recommendations())
-        all_suggestions.extend(self.get_kraken_recommendations())
-        all_suggestions.sort(key=lambda x: x.confidence, reverse=True)
-        return all_suggestions
-    
-    def get_balances(self) -> Dict:
-        """Get account balances."""
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._cache_lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._cache_lock:
+            if self._cache_generation == generation:
+                self._cache[key] = (now + ttl, value)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+        return value
+    
+    def invalidate_cache(self):
+        """Drop all memoized upstream results, including fetches in progress."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._inflight.clear()
+            self._cache_generation += 1
+    
+    def get_all_recommendations(self, force_refresh: bool = False) -> List[TradeSuggestion]:
+        """Get recommendations from all markets (cached for RECOMMENDATIONS_TTL)."""
+        return self._cached('recommendations', RECOMMENDATIONS_TTL,
+                            self._fetch_all_recommendations, force_refresh)
+    
+    def _fetch_all_recommendations(self) -> List[TradeSuggestion]:
+        """Fetch recommendations from all markets, bypassing the cache."""
+        # Kraken runs on this thread: it fans its tickers out to the pool
+        # itself, and nesting that inside a pool task can starve the pool.
+        kalshi = self._pool.submit(self._top_suggestions, self.get_kalshi_recommendations())
+        kraken = self._top_suggestions(self.get_kraken_recommendations())
+        return self._top_suggestions(itertools.chain(kraken, kalshi.result()))
+    
+    @staticmethod
+    def _top_suggestions(suggestions: Iterable[TradeSuggestion]) -> List[TradeSuggestion]:
+        """Highest-confidence suggestions first, capped at RECOMMENDATIONS_LIMIT."""
+        return heapq.nlargest(RECOMMENDATIONS_LIMIT, suggestions, key=attrgetter('confidence'))
+    
+    def get_balances(self, force_refresh: bool = False) -> Dict:
+        """Get account balances (cached for BALANCES_TTL)."""
+        return self._cached('balances', BALANCES_TTL, self._fetch_balances, force_refresh)
+    
+    def _fetch_balances(self) -> Dict:
+        """Fetch account balances, bypassing the cache."""
         balances = {'kalshi': {}, 'kraken': {}}
         
         if TRADING_AVAILABLE:
@@ -258,6 +514,7 @@ class TradingService:
                     order_type='market'
                 )
                 logger.info(f"Kalshi order executed: {result}")
+                self._record_executed(suggestion)
                 return True
                 
             elif suggestion.market == 'kraken':
@@ -268,6 +525,7 @@ class TradingService:
                     order_type='market'
                 )
                 logger.info(f"Kraken order executed: {result}")
+                self._record_executed(suggestion)
                 return True
                 
         except Exception as e:
@@ -276,14 +534,76 @@ class TradingService:
         
         return False
     
+    def _exec_worker(self):
+        """Execute queued trades one at a time, recording the outcome."""
+        while True:
+            suggestion = self._exec_queue.get()
+            try:
+                success = self.execute_trade(suggestion)
+            except Exception as e:
+                logger.error(f"Trade worker error for {suggestion.id}: {e}")
+                success = False
+            self._set_trade_status(suggestion.id, 'executed' if success else 'failed')
+            self._exec_queue.task_done()
+    
+    def _set_trade_status(self, trade_id: str, status: str):
+        """Record a trade's status, evicting the oldest past TRADE_HISTORY_LIMIT."""
+        with self._lock:
+            self.trade_status[trade_id] = status
+            self.trade_status.move_to_end(trade_id)
+            if len(self.trade_status) > TRADE_HISTORY_LIMIT:
+                self.trade_status.popitem(last=False)
+    
+    def get_trade_status(self, trade_id: str) -> Optional[str]:
+        """Return a trade's status ('pending', 'queued', 'executed', 'failed', 'cancelled') or None."""
+        with self._lock:
+            if trade_id in self.pending_trades:
+                return 'pending'
+            return self.trade_status.get(trade_id)
+    
+    def _record_executed(self, suggestion: TradeSuggestion):
+        """Append to the bounded executed-trade history."""
+        with self._lock:
+            self.executed_trades.append(suggestion)
+    
+    def add_pending_trade(self, suggestion: TradeSuggestion):
+        """Hold a trade until it is confirmed or cancelled."""
+        with self._lock:
+            self.pending_trades[suggestion.id] = suggestion
+    
+    def confirm_pending_trade(self, trade_id: str) -> bool:
+        """Move a pending trade to the execution queue; False if it isn't pending."""
+        # Pop and status change happen together so status polls never see a gap,
+        # and two concurrent confirms can't both execute
+        with self._lock:
+            suggestion = self.pending_trades.pop(trade_id, None)
+            if suggestion is None:
+                return False
+            self._set_trade_status(trade_id, 'queued')
+        self._exec_queue.put(suggestion)
+        return True
+    
+    def cancel_pending_trade(self, trade_id: str) -> bool:
+        """Cancel a pending trade; False if it isn't pending."""
+        with self._lock:
+            if self.pending_trades.pop(trade_id, None) is None:
+                return False
+            self._set_trade_status(trade_id, 'cancelled')
+        return True
+    
     def update_config(self, new_config: Dict):
         """Update trading configuration."""
-        self.config.update(new_config)
-        logger.info(f"Config updated: {self.config}")
+        with self._lock:
+            self.config.update(new_config)
+            config = dict(self.config)
+        # Cached suggestions are sized from the old trade_size
+        self.invalidate_cache()
+        logger.info(f"Config updated: {config}")
     
     def get_config(self) -> Dict:
-        """Get current configuration."""
-        return self.config
+        """Get a snapshot of the current configuration."""
+        with self._lock:
+            return dict(self.config)
 
 
 # Global trading service instance
@@ -292,6 +612,30 @@ trading_service = TradingService()
 
 # ============ HTTP API HANDLER ============
 
+# Response headers that never change, pre-encoded once
+_CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type, Authorization\r\n'
+)
+_JSON_HEADERS = b'Content-Type: application/json\r\n' + _CORS_HEADERS
+
+@functools.lru_cache(maxsize=128)
+def _login_response_template(username: str) -> Tuple[bytes, bytes]:
+    """Pre-encoded login success body for username, split around the token."""
+    return (b'{"status":"success","token":"',
+            b'","user":' + encode_json(username) + b'}')
+
+def requires_auth(handler):
+    """Reject the request with 401 unless it carries a live session token."""
+    @functools.wraps(handler)
+    def wrapper(self, *args):
+        if self.get_session_user() is None:
+            self.send_json_response(401, {'error': 'Unauthorized'})
+            return
+        return handler(self, *args)
+    return wrapper
+
 class TradingAPIHandler(BaseHTTPRequestHandler):
     """HTTP API handler for trading service."""
     
@@ -300,197 +644,233 @@ class TradingAPIHandler(BaseHTTPRequestHandler):
     
     def send_json_response(self, status_code: int, data: dict):
         """Send JSON response."""
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.send_json_bytes(status_code, encode_json(data))
+    
+    def send_json_bytes(self, status_code: int, body: bytes):
+        """Send an already-encoded JSON response body."""
+        self.write_response(status_code, _JSON_HEADERS, body)
+    
+    def write_response(self, status_code: int, headers: bytes, body: bytes = b''):
+        """Write status line, pre-encoded headers and body in a single write."""
+        self.log_request(status_code)
+        status = '%s %d %s\r\nServer: %s\r\nDate: %s\r\n' % (
+            self.protocol_version, status_code,
+            self.responses.get(status_code, ('',))[0],
+            self.version_string(), self.date_time_string()
+        )
+        self.wfile.write(b''.join((
+            status.encode('latin-1'), headers,
+            b'Content-Length: %d\r\n\r\n' % len(body), body
+        )))
+    
+    def send_error(self, code: int, message: Optional[str] = None, explain: Optional[str] = None):
+        """Send protocol-level errors (bad request line, unsupported method) as one JSON write."""
+        self.log_error("code %d, message %s", code, message)
+        self.close_connection = True
+        if message is None:
+            message = self.responses.get(code, ('Error',))[0]
+        body = b''
+        if self.command != 'HEAD' and code >= 200 and code not in (204, 304):
+            body = encode_json({'error': message})
+        self.write_response(code, _JSON_HEADERS + b'Connection: close\r\n', body)
+    
+    def force_refresh_requested(self) -> bool:
+        """Check for a ?force_refresh=1 query parameter."""
+        query = parse_qs(urlparse(self.path).query)
+        return query.get('force_refresh', ['0'])[0].lower() in ('1', 'true', 'yes')
     
     def get_session_user(self) -> Optional[str]:
         """Get the user from the session token."""
         auth_header = self.headers.get('Authorization', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header[7:]
-            if token in active_sessions:
-                return active_sessions[token]
-        return None
-    
-    def require_auth(self) -> bool:
-        """Check if the request is authenticated."""
-        # Skip auth for login endpoint
-        if self.path == '/api/auth/login':
-            return True
-        
-        user = self.get_session_user()
-        if not user:
-            self.send_json_response(401, {'error': 'Unauthorized'})
-            return False
-        return True
+        # Length check first so only plausible headers reach the memoized parser
+        if len(auth_header) != _BEARER_HEADER_LEN:
+            return None
+        token = _parse_bearer(auth_header)
+        if token is None:
+            return None
+        return get_session(token)
     
     def do_GET(self):
         """Handle GET requests."""
         path = self.path.split('?')[0]
         
-        if path == '/api/trading/recommendations':
-            if not self.require_auth():
-                return
-            suggestions = trading_service.get_all_recommendations()
-            data = {
-                'suggestions': [
-                    {
-                        'id': s.id,
-                        'market': s.market,
-                        'symbol': s.symbol,
-                        'side': s.side,
-                        'amount': s.amount,
-                        'price': s.price,
-                        'confidence': s.confidence,
-                        'reasoning': s.reasoning,
-                        'timestamp': s.timestamp
-                    }
-                    for s in suggestions
-                ],
-                'count': len(suggestions),
-                'timestamp': datetime.now().isoformat()
-            }
-            self.send_json_response(200, data)
-            
-        elif path == '/api/trading/balances':
-            if not self.require_auth():
-                return
-            balances = trading_service.get_balances()
-            self.send_json_response(200, {'balances': balances})
-            
-        elif path == '/api/trading/config':
-            if not self.require_auth():
-                return
-            config = trading_service.get_config()
-            self.send_json_response(200, {'config': config})
-            
-        elif path == '/api/trading/health':
-            self.send_json_response(200, {
-                'status': 'healthy',
-                'trading_available': TRADING_AVAILABLE,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-        elif path == '/api/auth/verify':
-            user = self.get_session_user()
-            if user:
-                self.send_json_response(200, {'authenticated': True, 'user': user})
-            else:
-                self.send_json_response(200, {'authenticated': False})
-            
-        else:
-            self.send_json_response(404, {'error': 'Not found'})
+        handler = self.GET_ROUTES.get(path)
+        if handler is not None:
+            return handler(self)
+        for prefix, handler in self.GET_PREFIX_ROUTES:
+            if path.startswith(prefix):
+                return handler(self, unquote(path[len(prefix):]))
+        self.send_json_response(404, {'error': 'Not found'})
     
     def do_POST(self):
         """Handle POST requests."""
         path = self.path.split('?')[0]
         
+        handler = self.POST_ROUTES.get(path)
+        if handler is None:
+            self.send_json_response(404, {'error': 'Not found'})
+            return
+        
         content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode() if content_length > 0 else '{}'
+        body = self.rfile.read(content_length) if content_length > 0 else b''
         
         try:
-            data = json.loads(body) if body else {}
+            data = decode_json(body) if body else {}
         except json.JSONDecodeError:
             self.send_json_response(400, {'error': 'Invalid JSON'})
             return
         
-        # Auth endpoints (no auth required)
-        if path == '/api/auth/login':
-            username = data.get('username', '')
-            password = data.get('password', '')
-            
-            if verify_password(username, password):
-                token = generate_session_token()
-                active_sessions[token] = username
-                self.send_json_response(200, {
-                    'status': 'success',
-                    'token': token,
-                    'user': username
-                })
-            else:
-                self.send_json_response(401, {'error': 'Invalid credentials'})
-            return
+        handler(self, data)
+    
+    # ---- GET handlers ----
+    
+    @requires_auth
+    def _handle_recommendations(self):
+        suggestions = trading_service.get_all_recommendations(self.force_refresh_requested())
+        # Splice each suggestion's cached JSON into the envelope
+        tail = encode_json({
+            'count': len(suggestions),
+            'timestamp': datetime.now().isoformat()
+        })
+        body = (b'{"suggestions":['
+                + b','.join(s.to_json_bytes() for s in suggestions)
+                + b'],' + tail[1:])
+        self.send_json_bytes(200, body)
+    
+    @requires_auth
+    def _handle_balances(self):
+        balances = trading_service.get_balances(self.force_refresh_requested())
+        self.send_json_response(200, {'balances': balances})
+    
+    @requires_auth
+    def _handle_get_config(self):
+        config = trading_service.get_config()
+        self.send_json_response(200, {'config': config})
+    
+    @requires_auth
+    def _handle_trade_status(self, trade_id: str):
+        status = trading_service.get_trade_status(trade_id)
+        if status is None:
+            self.send_json_response(404, {'error': 'Trade not found'})
+        else:
+            self.send_json_response(200, {'trade_id': trade_id, 'status': status})
+    
+    def _handle_health(self):
+        self.send_json_response(200, {
+            'status': 'healthy',
+            'trading_available': TRADING_AVAILABLE,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    def _handle_verify(self):
+        user = self.get_session_user()
+        if user:
+            self.send_json_response(200, {'authenticated': True, 'user': user})
+        else:
+            self.send_json_response(200, {'authenticated': False})
+    
+    # ---- POST handlers ----
+    
+    def _handle_login(self, data: dict):
+        username = data.get('username', '')
+        password = data.get('password', '')
         
-        # Trading endpoints (auth required)
-        if not self.require_auth():
-            return
+        if verify_password(username, password):
+            token = create_session(username)
+            # Tokens are hex, so they can be spliced in without escaping
+            prefix, suffix = _login_response_template(username)
+            self.send_json_bytes(200, prefix + token.encode() + suffix)
+        else:
+            self.send_json_response(401, {'error': 'Invalid credentials'})
+    
+    @requires_auth
+    def _handle_execute(self, data: dict):
+        suggestion_data = data.get('suggestion', {})
+        config = trading_service.get_config()
         
-        if path == '/api/trading/execute':
-            suggestion_data = data.get('suggestion', {})
-            
-            suggestion = TradeSuggestion(
-                market=suggestion_data.get('market', 'kalshi'),
-                symbol=suggestion_data.get('symbol', ''),
-                side=suggestion_data.get('side', 'yes'),
-                amount=float(suggestion_data.get('amount', trading_service.config['trade_size'])),
-                price=float(suggestion_data.get('price', 0.5)),
-                confidence=float(suggestion_data.get('confidence', 0.5)),
-                reasoning=suggestion_data.get('reasoning', ''),
-                timestamp=datetime.now().isoformat()
-            )
-            
-            if trading_service.config['confirm_trades']:
-                trading_service.pending_trades[suggestion.id] = suggestion
-                self.send_json_response(200, {
-                    'status': 'pending',
-                    'trade_id': suggestion.id,
-                    'message': 'Trade pending confirmation'
-                })
-            else:
-                success = trading_service.execute_trade(suggestion)
-                self.send_json_response(200, {
-                    'status': 'executed' if success else 'failed',
-                    'trade_id': suggestion.id
-                })
-                
-        elif path == '/api/trading/confirm':
-            trade_id = data.get('trade_id')
-            if trade_id in trading_service.pending_trades:
-                suggestion = trading_service.pending_trades[trade_id]
-                success = trading_service.execute_trade(suggestion)
-                del trading_service.pending_trades[trade_id]
-                self.send_json_response(200, {
-                    'status': 'executed' if success else 'failed',
-                    'trade_id': trade_id
-                })
-            else:
-                self.send_json_response(404, {'error': 'Trade not found'})
-                
-        elif path == '/api/trading/cancel':
-            trade_id = data.get('trade_id')
-            if trade_id in trading_service.pending_trades:
-                del trading_service.pending_trades[trade_id]
-                self.send_json_response(200, {'status': 'cancelled', 'trade_id': trade_id})
-            else:
-                self.send_json_response(404, {'error': 'Trade not found'})
-                
-        elif path == '/api/trading/config':
-            trading_service.update_config(data)
+        suggestion = TradeSuggestion(
+            market=suggestion_data.get('market', 'kalshi'),
+            symbol=suggestion_data.get('symbol', ''),
+            side=suggestion_data.get('side', 'yes'),
+            amount=float(suggestion_data.get('amount', config['trade_size'])),
+            price=float(suggestion_data.get('price', 0.5)),
+            confidence=float(suggestion_data.get('confidence', 0.5)),
+            reasoning=suggestion_data.get('reasoning', ''),
+            timestamp=datetime.now().isoformat()
+        )
+        
+        if config['confirm_trades']:
+            trading_service.add_pending_trade(suggestion)
             self.send_json_response(200, {
-                'status': 'updated',
-                'config': trading_service.get_config()
+                'status': 'pending',
+                'trade_id': suggestion.id,
+                'message': 'Trade pending confirmation'
             })
-                
         else:
-            self.send_json_response(404, {'error': 'Not found'})
+            success = trading_service.execute_trade(suggestion)
+            self.send_json_response(200, {
+                'status': 'executed' if success else 'failed',
+                'trade_id': suggestion.id
+            })
+    
+    @requires_auth
+    def _handle_confirm(self, data: dict):
+        trade_id = data.get('trade_id')
+        if trading_service.confirm_pending_trade(trade_id):
+            self.send_json_response(202, {
+                'status': 'queued',
+                'trade_id': trade_id
+            })
+        else:
+            self.send_json_response(404, {'error': 'Trade not found'})
+    
+    @requires_auth
+    def _handle_cancel(self, data: dict):
+        trade_id = data.get('trade_id')
+        if trading_service.cancel_pending_trade(trade_id):
+            self.send_json_response(200, {'status': 'cancelled', 'trade_id': trade_id})
+        else:
+            self.send_json_response(404, {'error': 'Trade not found'})
+    
+    @requires_auth
+    def _handle_update_config(self, data: dict):
+        trading_service.update_config(data)
+        self.send_json_response(200, {
+            'status': 'updated',
+            'config': trading_service.get_config()
+        })
+    
+    # Exact-path dispatch tables: one dict lookup per request
+    GET_ROUTES: Dict[str, Callable] = {
+        '/api/trading/recommendations': _handle_recommendations,
+        '/api/trading/balances': _handle_balances,
+        '/api/trading/config': _handle_get_config,
+        '/api/trading/health': _handle_health,
+        '/api/auth/verify': _handle_verify,
+    }
+    # Checked in order on a GET_ROUTES miss; the handler gets the unquoted rest
+    # of the path (trade ids can contain '/', e.g. Kraken pairs)
+    GET_PREFIX_ROUTES: Tuple[Tuple[str, Callable], ...] = (
+        ('/api/trading/status/', _handle_trade_status),
+    )
+    POST_ROUTES: Dict[str, Callable] = {
+        '/api/auth/login': _handle_login,
+        '/api/trading/execute': _handle_execute,
+        '/api/trading/confirm': _handle_confirm,
+        '/api/trading/cancel': _handle_cancel,
+        '/api/trading/config': _handle_update_config,
+    }
     
     def do_OPTIONS(self):
         """Handle CORS preflight."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.end_headers()
+        self.write_response(200, _CORS_HEADERS)
 
 
 def run_server(port: int = 3457):
     """Run the trading service."""
-    server = HTTPServer(('localhost', port), TradingAPIHandler)
+    # One thread per connection so slow upstream exchange calls for one
+    # client don't stall every other request.
+    server = ThreadingHTTPServer(('localhost', port), TradingAPIHandler)
     logger.info(f"🤖 Glorb Trader Service running on http://localhost:{port}")
     logger.info(f"📈 Endpoints:")
     logger.info(f"  🔐 POST   /api/auth/login         - Login")
@@ -501,6 +881,7 @@ def run_server(port: int = 3457):
     logger.info(f"  🚀 POST   /api/trading/execute     - Execute trade")
     logger.info(f"  ✅ POST   /api/trading/confirm     - Confirm trade")
     logger.info(f"  ❌ POST   /api/trading/cancel      - Cancel trade")
+    logger.info(f"  🔎 GET    /api/trading/status/<id> - Trade status")
     logger.info(f"")
     logger.info(f"🔑 Default Credentials:")
     logger.info(f"  Username: admin")